@@ -114,8 +114,9 @@ class MetricsFetcher:
         active_deployments = []
         if any(len(anomaly) > 0 for anomaly in [rds_anomaly, redis_anomaly, application_anomaly]):
             active_deployments = self.get_recent_active_deployments()
-            file_path = self.slack.create_anomaly_pdf({"rds_anomaly": rds_anomaly, "redis_anomaly": redis_anomaly, "application_anomaly": application_anomaly, "active_deployments": active_deployments,"search_to_ride_metrics":[ride_to_search_anomaly_current,ride_to_search_anomaly_past]}, start_date_time, end_date_time)
-            self.slack.send_pdf_report_on_slack(file_path=file_path, thread_ts=thread_ts, channel_id=channel_id)
+            pdf_bytes = self.slack.create_anomaly_pdf({"rds_anomaly": rds_anomaly, "redis_anomaly": redis_anomaly, "application_anomaly": application_anomaly, "active_deployments": active_deployments,"search_to_ride_metrics":[ride_to_search_anomaly_current,ride_to_search_anomaly_past]}, start_date_time, end_date_time)
+            if pdf_bytes:
+                self.slack.send_pdf_report_on_slack(content=pdf_bytes, thread_ts=thread_ts, channel_id=channel_id)
         else:
             print("No anomalies detected in the specified time range 🚫.")
         self.app_metrics_fetcher.delete_directory(output_dir)
@@ -0,0 +1,641 @@
+"""
+PDF report rendering with ReportLab.
+`slack.py` imports this module on first use, so processes that only send messages never load ReportLab or Pillow.
+"""
+import io
+import os
+from dataclasses import dataclass, field
+from itertools import repeat
+from typing import Optional, Sequence
+import orjson
+from PIL import Image as PILImage
+from reportlab.lib.pagesizes import A4
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import (SimpleDocTemplate, Paragraph, Spacer, Table, 
+                                TableStyle, Image, PageBreak, Flowable)
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+# ReportLab styles are never mutated during `doc.build`, so every report shares one copy.
+# Each style is named after its cache key so no two styles share a name.
+_STYLES = getSampleStyleSheet()
+_STYLE_CACHE = {
+    "body": _STYLES["BodyText"],
+    # Anomaly report
+    "anomaly_title": ParagraphStyle("anomaly_title", parent=_STYLES["Title"], fontSize=24, textColor=colors.darkblue, spaceAfter=12),
+    "anomaly_header": ParagraphStyle("anomaly_header", parent=_STYLES["Heading2"], fontSize=18, textColor=colors.darkred, spaceAfter=10, alignment=TA_CENTER),
+    "anomaly_bold": ParagraphStyle("anomaly_bold", parent=_STYLES["BodyText"], fontSize=11, textColor=colors.black, bold=True),
+    "anomaly_red_bold": ParagraphStyle("anomaly_red_bold", parent=_STYLES["BodyText"], fontSize=11, textColor=colors.red, bold=True),
+    "anomaly_metadata": ParagraphStyle("anomaly_metadata", parent=_STYLES["Heading2"], fontSize=12, textColor=colors.purple, bold=True),
+    # Current metrics report
+    "current_wrap": ParagraphStyle("current_wrap", fontSize=10, leading=12, textColor=colors.black, wordWrap="CJK"),
+    "current_title": ParagraphStyle("current_title", parent=_STYLES["Title"], fontSize=20, textColor=colors.darkblue, spaceAfter=12, alignment=1, underline=True),
+    "current_header": ParagraphStyle("current_header", parent=_STYLES["Heading2"], fontSize=16, textColor=colors.darkred, spaceAfter=10, alignment=1, underline=True),
+    "current_subheader": ParagraphStyle("current_subheader", parent=_STYLES["Heading2"], fontSize=14, textColor=colors.magenta, spaceAfter=10, alignment=1, underline=True),
+    "current_bold": ParagraphStyle("current_bold", parent=_STYLES["BodyText"], fontSize=12, textColor=colors.purple, bold=True),
+    "current_metadata": ParagraphStyle("current_metadata", parent=_STYLES["BodyText"], fontSize=14, textColor=colors.black, bold=True),
+    # 5xx / 0DC report
+    "errors_title": ParagraphStyle("errors_title", parent=_STYLES["Title"], fontSize=22, textColor=colors.darkblue, spaceAfter=12, alignment=1, underline=True),
+    "errors_header": ParagraphStyle("errors_header", parent=_STYLES["Heading2"], fontSize=18, textColor=colors.darkred, spaceAfter=10, underline=True, alignment=1),
+    "errors_bold": ParagraphStyle("errors_bold", parent=_STYLES["BodyText"], fontSize=12, textColor=colors.black, bold=True),
+    "errors_metadata": ParagraphStyle("errors_metadata", parent=_STYLES["BodyText"], fontSize=16, textColor=colors.black, bold=True),
+    "errors_wrap": ParagraphStyle("errors_wrap", fontSize=10, leading=12, textColor=colors.black, bold=True, wordWrap="CJK"),
+}
+
+_ORJSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+_ORJSON_KEY_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# Base style for a section table; `add_section` layers per-anomaly commands on top.
+_ANOMALY_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+    ("TEXTCOLOR", (0, 0), (-1, -1), colors.black),
+    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+    ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+    ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
+    ("BOX", (0, 0), (-1, -1), 1, colors.black),  # Box around the section
+    ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+])
+
+_DEPLOYMENT_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+    ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
+    ("GRID", (0, 0), (-1, -1), 1, colors.black),
+])
+
+# RDS / Redis / application tables in the current metrics report
+_METRICS_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("BOTTOMPADDING", (0, 0), (-1, 0), 10),
+    ("GRID", (0, 0), (-1, -1), 1, colors.black),
+])
+
+# Tables whose first column holds `_maybe_wrap` names: short names are plain strings and long ones
+# left-aligned Paragraphs, so the whole column is left-aligned to keep them consistent
+_NAME_COLUMN_LEFT = ("ALIGN", (0, 1), (0, -1), "LEFT")
+_INSTANCE_TABLE_STYLE = TableStyle([*_METRICS_TABLE_STYLE.getCommands(), _NAME_COLUMN_LEFT])
+
+# Istio and pod tables in the 5xx / 0DC report look like the deployment table
+_ERRORS_TABLE_STYLE = TableStyle([*_DEPLOYMENT_TABLE_STYLE.getCommands(), _NAME_COLUMN_LEFT])
+
+
+_is_list = list.__instancecheck__
+
+# Paragraph markup for anomaly table cells, bound once instead of rebuilding an f-string per cell
+_KEY_MARKUP = "<b>{}:</b>".format
+_ISSUE_VALUE_MARKUP = "<font color='red'><b>{}</b></font>".format
+_PRE_MARKUP = "<pre>{}</pre>".format
+
+# Metadata lines at the top of each report, in display order
+_ANOMALY_METADATA_MARKUP = tuple(f"{key}: {{}}".format for key in (
+    "📅 Report Generated At",
+    "🔍 Total Anomalies Detected",
+    "📌 Recent Deployments",
+    "🕒 Current Metrics Fetch Period",
+    "📉 Past Metrics Fetch Period",
+))
+_GENERATED_AT_MARKUP = "<b>  - Report Generated at </b>: {}".format
+_MONITORING_PERIOD_MARKUP = "<b>  - Monitoring Period </b>: {} to {}".format
+_START_TIME_MARKUP = "📅 <b>Start Time:</b> {}".format
+_END_TIME_MARKUP = "📅 <b>End Time:</b> {}".format
+
+# Status-code columns of the Istio and pod-error tables, in display order
+_ISTIO_KEYS = ("2xx", "3xx", "4xx", "5xx", "0DC", "unknown")
+_POD_ERROR_KEYS = ("4xx", "5xx", "0DC", "unknown")
+
+
+def _dumps_html(value):
+    """Serialize `value` as indented JSON with `<br/>` line breaks, as UTF-8 bytes."""
+    return orjson.dumps(value, default=str, option=_ORJSON_OPTIONS).replace(b"\n", b"<br/>")
+
+
+def _as_jpeg(path):
+    """
+    Re-encode a matplotlib PNG as an in-memory JPEG. ReportLab embeds JPEG data as-is,
+    while PNGs are decoded and deflated again on every build. Other formats pass through.
+    """
+    if not path.lower().endswith(".png"):
+        return path
+    buf = io.BytesIO()
+    with PILImage.open(path) as png:
+        png.convert("RGB").save(buf, format="JPEG", quality=85)
+    buf.seek(0)
+    return buf
+
+
+def _existing_files(paths):
+    """Return the entries of `paths` that are files, in order."""
+    return [path for path in paths if os.path.isfile(path)]
+
+
+def _embed_image(path, width, height):
+    """Platypus Image for a graph, embedded as JPEG."""
+    return Image(_as_jpeg(path), width=width, height=height)
+
+
+def _maybe_wrap(text, style, limit=28):
+    """Only pay for Paragraph line-breaking when `text` is too long to fit its table column unwrapped."""
+    return Paragraph(text, style) if len(text) > limit else text
+
+
+def _metrics_row(name, metrics, keys, wrap_style):
+    """Table row of `name` followed by `metrics[key]` for each key, defaulting missing counts to 0."""
+    return [_maybe_wrap(name, wrap_style), *map(metrics.get, keys, repeat(0))]
+
+
+def format_value(value, normal_style):
+    if isinstance(value, list):
+        if all(isinstance(item, dict) for item in value):  
+            formatted_items = [
+                b"<br/><b>Metrics %d:</b><br/>" % (i + 1) + _dumps_html(item)
+                for i, item in enumerate(value)
+            ]
+            formatted_value = b"<br/><br/>".join(formatted_items).decode()
+        else:
+            formatted_value = ", ".join(map(str, value))
+    elif isinstance(value, dict):
+        formatted_value = _dumps_html(value).decode()
+    else:
+        formatted_value = str(value) 
+
+    return Paragraph(_PRE_MARKUP(formatted_value), normal_style)
+
+
+def add_section(content, title, anomalies, header_style, normal_style, bold_style, red_bold_style, is_nested=False, level=0, flowable_cache=None):
+    """
+    Adds an anomaly section to the PDF as one bordered table with red-highlighted issue values.
+    Anomalies are walked with an explicit stack; nested details follow their parent as spanned sub-sections.
+    `flowable_cache` maps an anomaly's sorted-key JSON to its rendered rows so duplicated dicts are built once.
+
+    An anomaly whose values are all dicts has no rows of its own, but its children are still rendered:
+
+    >>> content = []
+    >>> add_section(content, "X", [{"ctx": {"pod": "NESTEDPOD", "Issue": "boom"}}], _STYLE_CACHE["anomaly_header"],
+    ...             _STYLE_CACHE["body"], _STYLE_CACHE["anomaly_bold"], _STYLE_CACHE["anomaly_red_bold"])
+    >>> any("NESTEDPOD" in getattr(cell, "text", "") for row in content[2]._cellvalues for cell in row)
+    True
+    """
+    if not anomalies:
+        return
+    if not is_nested:
+        content.append(Paragraph(f"🔹 <b>{title}</b>", header_style))
+        content.append(Spacer(1, 12))
+        # Most anomalies are flat dicts of scalars, which need no stack, cache or nested sub-sections
+        if all(isinstance(anomaly, dict) and not any(isinstance(v, (dict, list)) for v in anomaly.values()) for anomaly in anomalies):
+            return _add_section_flat(content, anomalies, normal_style, red_bold_style)
+
+    all_rows = [[Paragraph("<b>Field</b>", normal_style), Paragraph("<b>Value</b>", normal_style)]]
+    style_cmds = []
+    if flowable_cache is None:
+        flowable_cache = {}
+    # Pushed in reverse so pop() yields anomalies, and later each parent's children, in their original order
+    stack = [(anomaly, title if is_nested else None, level) for anomaly in reversed(anomalies)]
+
+    while stack:
+        anomaly, section_title, depth = stack.pop()
+        if not isinstance(anomaly, dict):
+            continue
+        cache_key = orjson.dumps(anomaly, default=str, option=_ORJSON_KEY_OPTIONS)
+        cached = flowable_cache.get(cache_key)
+        if cached is None:
+            cached = flowable_cache[cache_key] = flatten_anomaly(anomaly, normal_style, bold_style, red_bold_style)
+        rows, nested = cached
+
+        section_start = len(all_rows)
+        if section_title is not None:
+            all_rows.append([Paragraph(f"{'&nbsp;' * 4 * depth}🔽 <b>{section_title}</b>", bold_style), ""])
+            style_cmds.append(("SPAN", (0, section_start), (-1, section_start)))
+        all_rows.extend(rows)
+        # Nested details are rendered right after their parent, even when the parent has no rows of its own
+        stack.extend((child, key, depth + 1) for key, child in reversed(nested))
+
+        section_end = len(all_rows) - 1
+        if section_end >= section_start:
+            style_cmds.append(("BACKGROUND", (0, section_start), (-1, section_start), colors.lightgrey))
+            style_cmds.append(("LINEBELOW", (0, section_end), (-1, section_end), 1, colors.black))
+
+    add_anomaly_table(content, all_rows, style_cmds)
+
+
+def _add_section_flat(content, anomalies, normal_style, red_bold_style):
+    """`add_section` specialised for anomalies whose values are all scalars."""
+    all_rows = [[Paragraph("<b>Field</b>", normal_style), Paragraph("<b>Value</b>", normal_style)]]
+    style_cmds = []
+    for anomaly in anomalies:
+        if not anomaly:
+            continue
+        section_start = len(all_rows)
+        all_rows.extend([
+            [Paragraph(_KEY_MARKUP(key), red_bold_style), Paragraph(_ISSUE_VALUE_MARKUP(value), red_bold_style)]
+            if "Issue" in key else
+            [Paragraph(_KEY_MARKUP(key), normal_style), Paragraph(str(value), normal_style)]
+            for key, value in anomaly.items()
+        ])
+        section_end = len(all_rows) - 1
+        style_cmds.append(("BACKGROUND", (0, section_start), (-1, section_start), colors.lightgrey))
+        style_cmds.append(("LINEBELOW", (0, section_end), (-1, section_end), 1, colors.black))
+
+    add_anomaly_table(content, all_rows, style_cmds)
+
+
+def add_anomaly_table(content, all_rows, style_cmds):
+    """Append a section's rows as one table, so ReportLab wraps and paginates the section once."""
+    if len(all_rows) == 1:
+        return
+    table = Table(all_rows, colWidths=[180, 360], repeatRows=1)
+    table.setStyle(_ANOMALY_TABLE_STYLE)
+    table.setStyle(style_cmds)
+
+    content.extend((table, Spacer(1, 20)))
+
+
+def flatten_anomaly(anomaly, normal_style, bold_style, red_bold_style):
+    """
+    Build the table rows for a single anomaly dict in one pass.
+    Returns (rows, nested) where `nested` lists the (key, dict) children to render as sub-sections.
+    """
+    rows = []
+    nested = []
+    for key, value in anomaly.items():
+        if isinstance(value, dict):
+            nested.append((key, value))
+
+        elif isinstance(value, list):
+            rows.append([
+                Paragraph(_KEY_MARKUP(key), red_bold_style),
+                format_value(value, bold_style)
+            ])
+            nested.extend((key, item) for item in value if isinstance(item, dict))
+        else:
+            if "Issue" in key:
+                rows.append([
+                    Paragraph(_KEY_MARKUP(key), red_bold_style),
+                    Paragraph(_ISSUE_VALUE_MARKUP(value), red_bold_style)
+                ])
+            else:
+                rows.append([
+                    Paragraph(_KEY_MARKUP(key), normal_style),
+                    Paragraph(str(value), normal_style)
+                ])
+    return rows, nested
+
+
+def add_deployment_section(content, title, deployments, header_style, normal_style):
+    """Add a structured table for active deployments."""
+    if not deployments:
+        return
+
+    content.append(Paragraph(title, header_style))
+    content.append(Spacer(1, 6))
+
+    # Plain cell values are drawn directly; none of these columns need Paragraph wrapping
+    table_data = [["Deployment Name", "Created At", "Replicas"]]
+    table_data.extend([d["name"], d["created_at"], d["available_replicas"]] for d in deployments)
+
+    table = Table(table_data, colWidths=[300, 150, 80])
+    table.setStyle(_DEPLOYMENT_TABLE_STYLE)
+
+    content.extend((table, Spacer(1, 12)))
+
+
+@dataclass
+class Section:
+    """
+    One block of a report, rendered in this order: an optional heading followed by `gap`,
+    ready-made `flowables`, a table built from `rows` (header first), then `images`.
+    """
+    title: Optional[str] = None
+    style: Optional[ParagraphStyle] = None
+    # ReportLab sets `canv`/`_frame` on a flowable while drawing it, so every Section gets its own Spacer
+    gap: Optional[Flowable] = field(default_factory=lambda: Spacer(1, 12))
+    flowables: list = field(default_factory=list)
+    rows: Optional[list] = None
+    col_widths: Optional[list] = None
+    table_style: Optional[TableStyle] = None
+    images: Sequence[str] = ()
+    image_size: tuple = (500, 300)
+    page_break_after: bool = False
+
+
+def _build_pdf(sections):
+    """Render `sections` into an in-memory A4 PDF and return its bytes."""
+    buf = io.BytesIO()
+    content = []
+    for section in sections:
+        if section.title is not None:
+            content.append(Paragraph(section.title, section.style))
+            if section.gap is not None:
+                content.append(section.gap)
+        content.extend(section.flowables)
+        if section.rows is not None:
+            # Long tables split by row at page boundaries and repeat the header row on each page
+            table = Table(section.rows, colWidths=section.col_widths, repeatRows=1, splitByRow=True)
+            table.setStyle(section.table_style)
+            content.extend((table, Spacer(1, 12)))
+        for path in section.images:
+            content.extend((_embed_image(path, *section.image_size), Spacer(1, 12)))
+        if section.page_break_after:
+            content.append(PageBreak())
+    SimpleDocTemplate(buf, pagesize=A4).build(content)
+    return buf.getvalue()
+
+
+def build_anomaly_report_pdf(data, generated_at, current_period, past_period, days):
+    """
+    Render the multi-page anomaly report in memory and return the PDF bytes.
+    `current_period` and `past_period` are (start, end) pairs of already-formatted times.
+    """
+    # Custom Styles
+    header_style = _STYLE_CACHE["anomaly_header"]
+    normal_style = _STYLE_CACHE["body"]
+    bold_style = _STYLE_CACHE["anomaly_bold"]
+    red_bold_style = _STYLE_CACHE["anomaly_red_bold"]
+    metadata_style = _STYLE_CACHE["anomaly_metadata"]
+
+    current_start, current_end = current_period
+    past_start, past_end = past_period
+    # One pass over `data` collects the anomaly total and every section the report reads
+    total_anomalies = 0
+    sections_data = dict.fromkeys(("rds_anomaly", "redis_anomaly", "application_anomaly", "active_deployments"), [])
+    for key, value in data.items():
+        if _is_list(value):
+            total_anomalies += len(value)
+        if key in sections_data:
+            sections_data[key] = value
+    rds, redis, application, deployments = sections_data.values()
+
+    metadata = (
+        generated_at,
+        total_anomalies,
+        len(deployments),
+        f"{current_start} → {current_end}",
+        f"{past_start} → {past_end}",
+    )
+
+    # Identical anomaly dicts across all sections reuse the same rows; dropped once the PDF is built
+    flowable_cache = {}
+    anomaly_content = []
+    add_section(anomaly_content, "RDS Anomalies", rds, header_style, normal_style, bold_style, red_bold_style, flowable_cache=flowable_cache)
+    add_section(anomaly_content, "Redis Anomalies", redis, header_style, normal_style, bold_style, red_bold_style, flowable_cache=flowable_cache)
+    add_section(anomaly_content, "Application & Istio Anomalies", application, header_style, normal_style, bold_style, red_bold_style, flowable_cache=flowable_cache)
+
+    sections = [
+        Section("🚀 Auto-Generated Anomaly Report", _STYLE_CACHE["anomaly_title"]),
+        Section(flowables=[*(Paragraph(markup(value), metadata_style) for markup, value in zip(_ANOMALY_METADATA_MARKUP, metadata)), Spacer(1, 12)]),
+        Section(flowables=anomaly_content, page_break_after=True),
+    ]
+
+    if "search_to_ride_metrics" in data:
+        ride_to_search_metrics_current , ride_to_search_metrics_past = data["search_to_ride_metrics"]
+        sections += [
+            Section("📌 Ride to Search Metrics", header_style),
+            Section("🔹 <b>Currrent Ride to Search Ratio Metrics</b>", bold_style, gap=None, images=[ride_to_search_metrics_current], page_break_after=True),
+            Section(flowables=[Spacer(1, 12)]),
+            Section("🔹 <b>Past Ride to Search Ratio Metrics</b>", bold_style, gap=None, images=[ride_to_search_metrics_past], page_break_after=True),
+        ]
+
+    deployment_content = []
+    add_deployment_section(deployment_content, f"🚀 Deployments in past {days} days", deployments, header_style, normal_style)
+    sections.append(Section(flowables=deployment_content))
+
+    return _build_pdf(sections)
+
+
+# The current-metrics and 5xx / 0DC builders run inside the shared `slack._get_pdf_pool()` worker
+# processes, so they only touch their arguments and the module-level styles.
+
+def build_current_report_pdf(data, generated_at):
+    """Render the current system metrics report in memory and return the PDF bytes."""
+    wrap_style = _STYLE_CACHE["current_wrap"]
+    header_style = _STYLE_CACHE["current_header"]
+    bold_style = _STYLE_CACHE["current_bold"]
+    metadata_style = _STYLE_CACHE["current_metadata"]
+
+    sections = [
+        Section("🚀 System Metrics Report", _STYLE_CACHE["current_title"], gap=Spacer(1, 10)),
+        Section(flowables=[
+            Paragraph(_GENERATED_AT_MARKUP(generated_at), metadata_style),
+            Paragraph(_MONITORING_PERIOD_MARKUP(data["start"], data["end"]), metadata_style),
+            Spacer(1, 12),
+        ]),
+    ]
+
+    if "rds_metrics" in data:
+        sections.append(Section("📌 RDS Metrics", header_style, gap=Spacer(20, 20)))
+        for cluster, details in data["rds_metrics"].items():
+            instances = details["Instances"]
+            table_data = [None] * (len(instances) + 1)
+            table_data[0] = ["Instance", "Role", "CPU%", "Connections"]
+            for i, (instance, values) in enumerate(instances.items(), 1):
+                table_data[i] = [
+                    _maybe_wrap(instance, wrap_style),
+                    values["Role"],
+                    f"{values['CPUUtilization']}%",
+                    f"{values['DatabaseConnections']}"
+                ]
+            sections.append(Section(f"🔹 <b> <u>{cluster} </u></b>", bold_style, rows=table_data,
+                                    col_widths=[200, 80, 80, 100], table_style=_INSTANCE_TABLE_STYLE))
+
+    if "redis_metrics" in data:
+        sections.append(Section("📌 Redis Metrics", header_style))
+        for cluster, nodes in data["redis_metrics"].items():
+            instances = [(instance, values) for instance, values in nodes.items() if isinstance(values, dict) and "CPUUtilization" in values]
+            table_data = [None] * (len(instances) + 1)
+            table_data[0] = ["Instance", "Role", "CPU%", "Memory%", "Capacity%"]
+            for i, (instance, values) in enumerate(instances, 1):
+                table_data[i] = [
+                    _maybe_wrap(instance, wrap_style),
+                    values["Role"],
+                    f"{values['CPUUtilization']}%",
+                    f"{values['MemoryUsage']}%",
+                    f"{values['DatabaseCapacityUsage']}%",
+                ]
+            sections.append(Section(f"🔹 <b>{cluster}</b>", bold_style, rows=table_data, col_widths=[200, 80, 80, 80, 80],
+                                    table_style=_INSTANCE_TABLE_STYLE, page_break_after=True))
+
+    if "search_to_ride_metrics" in data:
+        sections.append(Section(" 📌 Ride to Search Metrics", header_style, images=[data["search_to_ride_metrics"]], page_break_after=True))
+
+    if data.get("rds_graph"):
+        sections.append(Section("📊 RDS Graphs", header_style, images=_existing_files(data["rds_graph"]), page_break_after=True))
+
+    if data.get("redis_graph"):
+        sections.append(Section("📊 Redis Graphs", header_style, images=_existing_files(data["redis_graph"]), page_break_after=True))
+
+    if "application_metrics" in data:
+        sections.append(Section("📌 Application API Metrics", header_style))
+        for metric, value in data["application_metrics"].items():
+            sections.append(Section(f"🔹 <b>{metric.upper()}</b>", _STYLE_CACHE["current_subheader"]))
+            for service, status_codes in value.items():
+                sections.append(Section(f"🔸 <b>{service}</b>", bold_style, rows=[["Status Code", "Requests"], *map(list, status_codes.items())],
+                                        col_widths=[100, 100], table_style=_METRICS_TABLE_STYLE))
+
+    return _build_pdf(sections)
+
+
+def build_5xx_0dc_report_pdf(data):
+    """Render the 5xx / 0DC anomaly report in memory and return the PDF bytes."""
+    if data.get("fast_path"):
+        buf = io.BytesIO()
+        _render_5xx_0dc_report_low_level(buf, data)
+        return buf.getvalue()
+
+    header_style = _STYLE_CACHE["errors_header"]
+    metadata_style = _STYLE_CACHE["errors_metadata"]
+    wrap_style = _STYLE_CACHE["errors_wrap"]
+    image_size = (550, 270)
+
+    sections = [
+        Section("🚀 Current Anomaly Detection Report", _STYLE_CACHE["errors_title"]),
+        Section(flowables=[
+            Paragraph(_START_TIME_MARKUP(data.get("Start Time", "N/A")), metadata_style),
+            Paragraph(_END_TIME_MARKUP(data.get("End Time", "N/A")), metadata_style),
+            Spacer(1, 12),
+        ]),
+    ]
+
+    if "istio_metrics" in data and len(data["istio_metrics"]) > 0:
+        items = data["istio_metrics"]
+        table_data = [None] * (len(items) + 1)
+        table_data[0] = ["Service", "2xx", "3xx", "4xx", "5xx", "0DC", "Unknown"]  # Table Headers
+        for i, (service, metrics) in enumerate(items.items(), 1):
+            table_data[i] = _metrics_row(service, metrics, _ISTIO_KEYS, wrap_style)
+        sections.append(Section("🔹 Istio Metrics", header_style, gap=Spacer(1, 6), rows=table_data, col_widths=[200, 50, 50, 50, 50, 50, 50],
+                                table_style=_ERRORS_TABLE_STYLE, page_break_after=True))
+
+    if "istio_pod_wise_errors" in data and len(data["istio_pod_wise_errors"]) > 0:
+        items = data["istio_pod_wise_errors"]
+        pod_metric_table = [None] * (len(items) + 1)
+        pod_metric_table[0] = ["Service", "4xx", "5xx", "0DC", "Unknown"]
+        for i, (pod, metrics) in enumerate(items.items(), 1):
+            pod_metric_table[i] = _metrics_row(pod, metrics, _POD_ERROR_KEYS, wrap_style)
+        sections.append(Section("🔹 Pod Errors", header_style, gap=Spacer(1, 6), rows=pod_metric_table, col_widths=[220, 50, 50, 50, 50],
+                                table_style=_ERRORS_TABLE_STYLE, page_break_after=True))
+
+    if "search_to_ride_metrics" in data and len(data["search_to_ride_metrics"]) > 0:
+        sections.append(Section("🔹 Search to Ride Metrics", header_style, gap=Spacer(1, 6), images=[data["search_to_ride_metrics"]],
+                                image_size=image_size, page_break_after=True))
+
+    if "pod_anomalies" in data and len(data["pod_anomalies"]) > 0:
+        sections.append(Section("🔹 Pods CPU/Memory Graph", header_style, gap=Spacer(1, 6)))
+        # One batched existence check for every pod's graphs
+        existing = set(_existing_files([path for image_paths in data["pod_anomalies"].values() for path in image_paths]))
+        for pod, image_paths in data["pod_anomalies"].items():
+            sections.append(Section(f"<b>Service: {pod} </b>", header_style, gap=Spacer(1, 6),
+                                    images=[path for path in image_paths if path in existing], image_size=image_size))
+        sections[-1].page_break_after = True
+
+    if "api_anomalies" in data and len(data["api_anomalies"]) > 0:
+        sections.append(Section("🔹 API Anomalies", header_style, gap=Spacer(1, 6), images=_existing_files(data["api_anomalies"]),
+                                image_size=image_size, page_break_after=True))
+
+    return _build_pdf(sections)
+
+
+def _fit_text(text, width, font_name, font_size):
+    """Truncate `text` with an ellipsis so it fits in `width` points."""
+    if stringWidth(text, font_name, font_size) <= width:
+        return text
+    while text and stringWidth(text + "…", font_name, font_size) > width:
+        text = text[:-1]
+    return text + "…"
+
+
+def _render_5xx_0dc_report_low_level(output, data):
+    """
+    Draw the 5xx / 0DC report straight onto a canvas, skipping Platypus wrap and pagination.
+    `output` is a path or a writable file-like object.
+    Tables use fixed-height rows, so long service names are truncated instead of wrapped.
+    """
+    c = canvas.Canvas(output, pagesize=A4)
+    page_width, page_height = A4
+    margin = 40
+    row_height = 16
+    y = page_height - margin
+
+    def ensure_space(height):
+        nonlocal y
+        if y - height < margin:
+            c.showPage()
+            y = page_height - margin
+
+    def draw_heading(text, font_size, color):
+        nonlocal y
+        ensure_space(font_size + 12)
+        c.setFont("Helvetica-Bold", font_size)
+        c.setFillColor(color)
+        c.drawCentredString(page_width / 2, y - font_size, text)
+        y -= font_size + 12
+
+    def draw_row(cells, col_widths, background, text_color, font_name):
+        nonlocal y
+        ensure_space(row_height)
+        x = margin
+        c.setFont(font_name, 9)
+        for cell, width in zip(cells, col_widths):
+            c.setFillColor(background)
+            c.rect(x, y - row_height, width, row_height, fill=1, stroke=1)
+            c.setFillColor(text_color)
+            c.drawString(x + 3, y - row_height + 5, _fit_text(str(cell), width - 6, font_name, 9))
+            x += width
+        y -= row_height
+
+    def draw_table(title, header, keys, rows, col_widths):
+        nonlocal y
+        draw_heading(title, 14, colors.darkred)
+        c.setStrokeColor(colors.black)
+        draw_row(header, col_widths, colors.grey, colors.whitesmoke, "Helvetica-Bold")
+        for name, metrics in rows.items():
+            # Repeat the header at the top of every new page
+            if y - row_height < margin:
+                c.showPage()
+                y = page_height - margin
+                draw_row(header, col_widths, colors.grey, colors.whitesmoke, "Helvetica-Bold")
+            draw_row([name, *map(metrics.get, keys, repeat(0))], col_widths, colors.beige, colors.black, "Helvetica")
+        y -= 12
+
+    def draw_images(paths, width=550, height=270):
+        nonlocal y
+        for image_path in _existing_files(paths):
+            ensure_space(height + 12)
+            c.drawImage(ImageReader(_as_jpeg(image_path)), (page_width - width) / 2, y - height, width=width, height=height)
+            y -= height + 12
+
+    draw_heading("Current Anomaly Detection Report", 22, colors.darkblue)
+    c.setFont("Helvetica-Bold", 12)
+    c.setFillColor(colors.black)
+    c.drawString(margin, y - 12, f"Start Time: {data.get('Start Time', 'N/A')}")
+    c.drawString(margin, y - 28, f"End Time: {data.get('End Time', 'N/A')}")
+    y -= 44
+
+    if data.get("istio_metrics"):
+        draw_table("Istio Metrics", ["Service", "2xx", "3xx", "4xx", "5xx", "0DC", "Unknown"], _ISTIO_KEYS, data["istio_metrics"], [215, 50, 50, 50, 50, 50, 50])
+
+    if data.get("istio_pod_wise_errors"):
+        draw_table("Pod Errors", ["Service", "4xx", "5xx", "0DC", "Unknown"], _POD_ERROR_KEYS, data["istio_pod_wise_errors"], [315, 50, 50, 50, 50])
+
+    if data.get("search_to_ride_metrics"):
+        draw_heading("Search to Ride Metrics", 14, colors.darkred)
+        draw_images([data["search_to_ride_metrics"]])
+
+    if data.get("pod_anomalies"):
+        draw_heading("Pods CPU/Memory Graph", 14, colors.darkred)
+        for pod, image_paths in data["pod_anomalies"].items():
+            draw_heading(f"Service: {pod}", 12, colors.darkred)
+            draw_images(image_paths)
+
+    if data.get("api_anomalies"):
+        draw_heading("API Anomalies", 14, colors.darkred)
+        draw_images(data["api_anomalies"])
+
+    c.save()
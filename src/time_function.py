@@ -1,13 +1,99 @@
-import datetime
-import pytz
-from datetime import datetime, timedelta
+import logging
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+# Resolved once; zoneinfo caches the UTC offsets so aware datetimes can be
+# built directly with tzinfo= instead of pytz's localize() pass
+_IST = ZoneInfo("Asia/Kolkata")
+_UTC = timezone.utc
+# IST has had no DST or offset change since 1945
+_IST_OFFSET = timedelta(hours=5, minutes=30)
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=32)
+def _cached_timedelta(items):
+    """
+    Build a timedelta from sorted (unit, amount) pairs. The same few
+    time_delta shapes ({"hours": 1}, ...) recur on every scheduled run.
+    """
+    return timedelta(**dict(items))
+
+
+def _reference_epochs(now_ts, now_day_seconds, target_hour, target_minute, days_before):
+    """
+    Integer core of `get_target_datetime`: today's (or yesterday's, if still
+    ahead of now) target_hour:target_minute as an epoch, plus the same time
+    `days_before` days earlier. IST has a fixed offset, so seconds-of-day
+    arithmetic on the local clock reading is exact.
+
+    :param now_ts: Current epoch seconds
+    :param now_day_seconds: Seconds elapsed since local midnight at `now_ts`
+    :return: Tuple of (reference_ts, past_ts) as integer epoch seconds
+    """
+    reference_ts = int(now_ts) - now_day_seconds + target_hour * 3600 + target_minute * 60
+    if reference_ts > now_ts:
+        reference_ts -= 86400
+    return reference_ts, reference_ts - days_before * 86400
+
+
+@lru_cache(maxsize=256)
+def _target_windows(now_minute_ts, now_day_seconds, days_before, target_hour, target_minute, delta_items):
+    """
+    UTC windows for `get_target_datetime`. Keyed on the clock reading truncated
+    to the minute, so repeated requests within the same minute are served from
+    the cache; the result only changes once the minute rolls over.
+
+    :return: Tuple of (current_start, current_end, past_start, past_end) UTC datetimes
+    """
+    reference_ts, past_ts = _reference_epochs(now_minute_ts, now_day_seconds, target_hour, target_minute, days_before)
+    timedelta_range = _cached_timedelta(delta_items)
+    current_end_time_utc = datetime.fromtimestamp(reference_ts, _UTC)
+    past_end_time_utc = datetime.fromtimestamp(past_ts, _UTC)
+    return (current_end_time_utc - timedelta_range, current_end_time_utc,
+            past_end_time_utc - timedelta_range, past_end_time_utc)
+
+
+def _parse_ymdhms(time_str):
+    """
+    Parse "YYYY-MM-DD HH:MM:SS[.ffffff]" by slicing the fixed-width fields.
+    Faster than strptime, which goes through a regex on every call.
+
+    :param time_str: Time as a string in one of the two formats above
+    :return: Naive datetime
+    """
+    if len(time_str) < 19 or time_str[4] != "-" or time_str[7] != "-" or time_str[10] != " " \
+            or time_str[13] != ":" or time_str[16] != ":":
+        raise ValueError(f"time data {time_str!r} does not match format 'YYYY-MM-DD HH:MM:SS[.ffffff]'")
+    microsecond = 0
+    if len(time_str) > 19:
+        fraction = time_str[20:]
+        if time_str[19] != "." or not 1 <= len(fraction) <= 6 or not fraction.isdigit():
+            raise ValueError(f"time data {time_str!r} does not match format 'YYYY-MM-DD HH:MM:SS[.ffffff]'")
+        microsecond = int(fraction.ljust(6, "0"))
+    return datetime(int(time_str[0:4]), int(time_str[5:7]), int(time_str[8:10]),
+                    int(time_str[11:13]), int(time_str[14:16]), int(time_str[17:19]), microsecond)
+
+
+def _format_ymdhm(time_obj):
+    """
+    Format a datetime as "YYYY-MM-DD HH:MM" from its fields in a single pass;
+    cheaper than strftime, which goes through the time module for every call.
+    """
+    return f"{time_obj.year:04d}-{time_obj.month:02d}-{time_obj.day:02d} {time_obj.hour:02d}:{time_obj.minute:02d}"
+
 
 class TimeFunction:
+    # Only per-instance state; everything else is a staticmethod over module-level caches
+    __slots__ = ("default_time_delta",)
+
     def __init__(self,config):
         self.default_time_delta = config.get("DEFAULT_TIME_DELTA", {"hours": 1})
-        pass
         
-    def get_target_datetime(self, days_before=None, target_hour=None, target_minute=None, time_delta=None, now_time_delta = 0):
+    @staticmethod
+    def get_target_datetime(days_before=None, target_hour=None, target_minute=None, time_delta=None, now_time_delta = 0, as_epoch=False):
         """
         Get a datetime object:
         - If `target_hour:target_minute` is earlier than the current time, return today's date with that time.
@@ -18,59 +104,69 @@ class TimeFunction:
         :param target_hour: The target hour (0-23).
         :param target_minute: The target minute (0-59).
         :param time_delta: Dictionary (e.g., {"hours": 1}) defining the time range for fetching metrics.
-        :return: Tuple of ([current_start_time_utc, current_end_time_utc], [past_start_time_utc, past_end_time_utc])
+        :param as_epoch: Return integer epoch seconds instead of UTC datetimes.
+        :return: Tuple of ((current_start_time_utc, current_end_time_utc), (past_start_time_utc, past_end_time_utc))
         """
         if now_time_delta is None:
             now_time_delta = 0
         # Default time range of 1 hour if None provided
         if time_delta is None:
             time_delta = {"hours": 1}
-        ist = pytz.timezone("Asia/Kolkata")
-        utc = pytz.utc
-        now = datetime.now(ist)
+        now = datetime.now(_IST)
         if now_time_delta < days_before:
             now = now - timedelta(days=now_time_delta)
         days_before = 0 if days_before is None else days_before
-        target_hour = now.hour if target_hour is None else target_hour
-        target_minute = now.minute if target_minute is None else target_minute
-
-        # Determine reference datetime (today or yesterday at target hour)
-        if (target_hour, target_minute) <= (now.hour, now.minute):
-            reference_datetime = now.replace(hour=target_hour, minute=target_minute, second=0, microsecond=0)
-        else:
-            reference_datetime = (now - timedelta(days=1)).replace(hour=target_hour, minute=target_minute, second=0, microsecond=0)
+        now_hour, now_minute = now.hour, now.minute
+        target_hour = now_hour if target_hour is None else target_hour
+        target_minute = now_minute if target_minute is None else target_minute
 
-        # Get past datetime `days_before` days ago
-        past_datetime = reference_datetime - timedelta(days=days_before)
+        if as_epoch:
+            # Epoch consumers (CloudWatch, Prometheus) never need the datetime objects
+            reference_ts, past_ts = _reference_epochs(
+                now.timestamp(), now_hour * 3600 + now_minute * 60 + now.second,
+                target_hour, target_minute, days_before)
+            delta_seconds = int(_cached_timedelta(tuple(sorted(time_delta.items()))).total_seconds())
+            return ((reference_ts - delta_seconds, reference_ts), (past_ts - delta_seconds, past_ts))
 
-        timedelta_range = timedelta(**time_delta)
+        current_start_time_utc, current_end_time_utc, past_start_time_utc, past_end_time_utc = _target_windows(
+            int(now.timestamp()) - now.second, now_hour * 3600 + now_minute * 60,
+            days_before, target_hour, target_minute, tuple(sorted(time_delta.items())))
 
-        # Compute current and past time ranges
-        current_start_time = reference_datetime - timedelta_range
-        current_end_time = reference_datetime
-        past_start_time = past_datetime - timedelta_range
-        past_end_time = past_datetime
+        logger.debug("UTC times: current %s -> %s, past %s -> %s",
+                     current_start_time_utc, current_end_time_utc, past_start_time_utc, past_end_time_utc)
 
-        # Convert all times to UTC
-        current_start_time_utc = current_start_time.astimezone(utc)
-        current_end_time_utc = current_end_time.astimezone(utc)
-        past_start_time_utc = past_start_time.astimezone(utc)
-        past_end_time_utc = past_end_time.astimezone(utc)
+        return ((current_start_time_utc, current_end_time_utc), (past_start_time_utc, past_end_time_utc))
 
-        # ✅ Print formatted datetime info
-        print(f"🕒 **IST Times:**")
-        print(f"   ➤ Current: {current_start_time.strftime('%Y-%m-%d %H:%M:%S')} → {current_end_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"   ➤ Past: {past_start_time.strftime('%Y-%m-%d %H:%M:%S')} → {past_end_time.strftime('%Y-%m-%d %H:%M:%S')}")
-
-        print(f"\n🌍 **UTC Times:**")
-        print(f"   ➤ Current: {current_start_time_utc.strftime('%Y-%m-%d %H:%M:%S')} → {current_end_time_utc.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"   ➤ Past: {past_start_time_utc.strftime('%Y-%m-%d %H:%M:%S')} → {past_end_time_utc.strftime('%Y-%m-%d %H:%M:%S')}\n")
+    @staticmethod
+    def get_target_datetime_batch(windows, time_delta=None):
+        """
+        Compute many `get_target_datetime` windows against a single clock reading.
+        Results stay as epoch seconds; callers convert only the ones they use
+        with `datetime.fromtimestamp(ts, timezone.utc)`.
 
-        return ([current_start_time_utc, current_end_time_utc], [past_start_time_utc, past_end_time_utc])
+        :param windows: Iterable of (days_before, target_hour, target_minute) tuples.
+        :param time_delta: Dictionary (e.g., {"hours": 1}) defining the time range for every window.
+        :return: List of (current_start, current_end, past_start, past_end) integer epoch seconds
+        """
+        if time_delta is None:
+            time_delta = {"hours": 1}
+        delta_seconds = int(_cached_timedelta(tuple(sorted(time_delta.items()))).total_seconds())
+        now = datetime.now(_IST)
+        now_ts = now.timestamp()
+        now_day_seconds = now.hour * 3600 + now.minute * 60 + now.second
+        # Bind once so the loop body uses fast locals instead of global/attribute lookups
+        reference_epochs = _reference_epochs
+        results = []
+        append = results.append
+        for days_before, target_hour, target_minute in windows:
+            reference_ts, past_ts = reference_epochs(now_ts, now_day_seconds, target_hour, target_minute, days_before)
+            append((reference_ts - delta_seconds, reference_ts, past_ts - delta_seconds, past_ts))
+        return results
 
 
     # Function to convert time between UTC and IST 
-    def convert_time(self, time_str, from_tz="UTC"):
+    @staticmethod
+    def convert_time(time_str, from_tz="UTC"):
         """
         Convert time between UTC and IST:
         - If from_tz="IST", it assumes the input is in IST and converts to UTC.
@@ -81,59 +177,57 @@ class TimeFunction:
         :param from_tz: Source timezone ("UTC", "IST", or "Local")
         :return: Converted time as a string in "YYYY-MM-DD HH:MM:SS.ssssss"
         """
-        ist_tz = pytz.timezone("Asia/Kolkata")
-        utc_tz = pytz.utc
-
         if from_tz == "IST":
-            from_zone = ist_tz
-            to_zone = utc_tz  # Convert IST → UTC
+            offset = -_IST_OFFSET  # Convert IST → UTC
         elif from_tz == "UTC":
-            from_zone = utc_tz
-            to_zone = ist_tz  # Convert UTC → IST
+            offset = _IST_OFFSET  # Convert UTC → IST
         else:
             raise ValueError("Invalid timezone. Use 'UTC', or 'IST'.")
-        try:
-            time_obj = datetime.strptime(time_str, "%Y-%m-%d %H:%M:%S.%f") 
-        except ValueError:
-            time_obj = datetime.strptime(time_str, "%Y-%m-%d %H:%M:%S")  
-
-        time_obj = from_zone.localize(time_obj) 
-        converted_time = time_obj.astimezone(to_zone) 
-        return converted_time.strftime("%Y-%m-%d %H:%M") 
+        # Both zones have a fixed offset, so naive arithmetic replaces the tzinfo round trip
+        return _format_ymdhm(_parse_ymdhms(time_str) + offset)
     
+    @staticmethod
+    def format_ist(time_obj):
+        """
+        Format a datetime in IST without a string round trip through `convert_time`.
+
+        :param time_obj: Timezone-aware datetime (naive values are treated as UTC)
+        :return: IST time as a string in "YYYY-MM-DD HH:MM"
+        """
+        if time_obj.tzinfo is None:
+            time_obj = time_obj.replace(tzinfo=_UTC)
+        return _format_ymdhm(time_obj.astimezone(_IST))
+
     def get_current_fetch_time(self, start_time = None, end_time = None,time_delta = None):
         """
         Get the current time in UTC timezone.
         """
-        ist_tz = pytz.timezone("Asia/Kolkata")
-        utc_tz = pytz.utc
         time_delta_default = self.default_time_delta if time_delta is None else {"hours": time_delta}
         if start_time and end_time:
             # Here start_time and end_time are the time only we have to return date
-            now = datetime.now(ist_tz)
+            now = datetime.now(_IST)
             current_date = now.strftime("%Y-%m-%d")
             current_time = datetime.strptime(f"{current_date} {start_time}", "%Y-%m-%d %H:%M")
             end_time = datetime.strptime(f"{current_date} {end_time}", "%Y-%m-%d %H:%M")
-            return current_time.astimezone(utc_tz), end_time.astimezone(utc_tz)
+            return current_time.astimezone(_UTC), end_time.astimezone(_UTC)
         elif start_time:
             # Here start_time is the time only we have to return date
-            now = datetime.now(ist_tz)
+            now = datetime.now(_IST)
             current_date = now.strftime("%Y-%m-%d")
             current_time = datetime.strptime(f"{current_date} {start_time}", "%Y-%m-%d %H:%M")
-            return current_time.astimezone(utc_tz), now.astimezone(utc_tz)
+            return current_time.astimezone(_UTC), now.astimezone(_UTC)
         else:
-            start = datetime.now(utc_tz) - timedelta(**time_delta_default)
-            end = datetime.now(utc_tz)
-            return start, end
+            end = datetime.now(_UTC)
+            return end - _cached_timedelta(tuple(sorted(time_delta_default.items()))), end
         
 
     
 if __name__ == "__main__":
     time_function = TimeFunction({"DEFAULT_TIME_DELTA": {"hours": 1}})
-    a,b= time_function.get_current_time("10:00","11:00")
+    a,b= time_function.get_current_fetch_time("10:00","11:00")
     print(a,b)
-    a,b= time_function.get_current_time("10:00")
+    a,b= time_function.get_current_fetch_time("10:00")
     print(a,b)
-    a,b= time_function.get_current_time(time_delta=60)
+    a,b= time_function.get_current_fetch_time(time_delta=60)
     print(a,b)
 